@@ -1,17 +1,193 @@
 import asyncio
+import html
 import json
 import os
 import logging
-import feedparser
+import random
 import requests
 import re
+import shutil
+import threading
+import time
+import xml.etree.ElementTree as ET
+from requests.adapters import HTTPAdapter
+import urllib3
+from urllib3.util.retry import Retry
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional: sem ele usa o json da stdlib
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # uvloop é opcional e não existe no Windows: sem ele usa o loop padrão do asyncio
+    uvloop = None
 
 # Configuração de logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+def json_dumps(obj, pretty: bool = True) -> bytes:
+    """Serializa para JSON (UTF-8, indentado ou compacto); só tipos JSON nativos (save_data converte os IDs vistos)"""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def json_loads(raw: bytes):
+    """Desserializa JSON a partir de bytes"""
+    if orjson:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+# Limite de tamanho de uma mensagem do Telegram e separador entre canais numa mesma notificação
+_MAX_MESSAGE_LENGTH = 4096
+_NOTIFICATION_SEPARATOR = "\n\n——\n\n"
+
+# Cabeçalho das chamadas à API do Telegram (corpo já serializado por json_dumps)
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Padrões de Channel ID (compilados uma única vez)
+_CHANNEL_ID_RE = re.compile(r'^UC[a-zA-Z0-9_-]{22}$')
+_URL_CHANNEL_RE = re.compile(r'youtube\.com/channel/(UC[a-zA-Z0-9_-]{22})')
+
+# Tamanho máximo do histórico de IDs já vistos por canal
+_MAX_SEEN_IDS = 50
+
+# Quantos vídeos mais recentes são lidos de cada feed
+_FEED_LIMIT = 5
+
+# Namespaces do feed Atom do YouTube
+_FEED_NS = {'a': 'http://www.w3.org/2005/Atom', 'yt': 'http://www.youtube.com/xml/schemas/2015'}
+_ENTRY_TAG = '{http://www.w3.org/2005/Atom}entry'
+
+# Vídeo extraído do feed RSS (tupla leve: acesso por atributo, sem hashing de chave)
+Video = namedtuple('Video', 'video_id title link published channel_name')
+
+# Mensagens fixas (montadas uma única vez)
+_START_MESSAGE = """🤖 <b>YouTube Telegram Bot</b>
+
+Olá! Eu monitoro canais do YouTube e te aviso quando há novos vídeos.
+
+<b>⚡ IMPORTANTE:</b> Eu só notífico sobre vídeos publicados APÓS você adicionar o canal (não de vídeos antigos).
+
+<b>Comandos disponíveis:</b>
+/help - Mostra esta ajuda
+/add [Channel ID] - Adiciona um canal para monitorar
+/remove [nome] - Remove um canal
+/list - Lista canais monitorados
+/status - Status do bot
+
+<b>⚠️ IMPORTANTE: Use o Channel ID (formato UC...)</b>
+
+<b>📺 Como encontrar o Channel ID:</b>
+
+<b>Método 1 - URL direta:</b>
+Se a URL for: youtube.com/channel/UCxxxx
+→ Copie: UCxxxx
+
+<b>Método 2 - Via qualquer vídeo:</b>
+1. Abra qualquer vídeo do canal
+2. Clique no nome do canal
+3. Na URL que abrir, copie o UCxxxx
+
+<b>Método 3 - Código fonte:</b>
+1. Vá no canal
+2. Clique com botão direito → "Ver código fonte"
+3. Ctrl+F → "channelId"
+4. Copie o UCxxxx
+
+<b>Exemplo:</b>
+/add UCU5JicSrEM5A63jkJ2QvGYw
+
+🎯 Vídeos atuais são marcados como "já vistos" automaticamente!
+
+Pronto para começar! 🚀"""
+
+_STATUS_TEMPLATE = """📊 <b>Status do Bot</b>
+
+🎯 <b>Canais monitorados:</b> {enabled}/{total}
+📹 <b>Vídeos rastreados:</b> {tracked}
+🔄 <b>Verificação:</b> A cada 1 minuto
+✅ <b>Status:</b> Ativo
+
+<b>Última verificação:</b> {now}
+
+⚡ <b>Responsividade:</b> Comandos processados instantaneamente (long polling)"""
+
+# Notificação de um único vídeo e item de vídeo dentro de uma notificação agrupada
+_VIDEO_TEMPLATE = """🎥 <b>Novo vídeo no canal {channel_name}!</b>
+
+📹 <b>{title}</b>
+
+🔗 <a href="{link}">Assistir agora</a>
+
+📅 {published}"""
+
+_VIDEO_ENTRY_TEMPLATE = """📹 <b>{title}</b>
+🔗 <a href="{link}">Assistir agora</a>
+📅 {published}"""
+
+async def run_in_daemon_thread(func):
+    """Executa func numa thread daemon e aguarda o resultado sem bloquear o event loop
+    
+    Ao contrário de asyncio.to_thread, a thread não é aguardada no encerramento do asyncio.run:
+    um long poll de 50s em andamento não atrasa o Ctrl+C.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def resolve(result, error):
+        if future.done():  # tarefa já cancelada (encerramento)
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    
+    def worker():
+        result, error = None, None
+        try:
+            result = func()
+        except Exception as e:
+            error = e
+        try:
+            loop.call_soon_threadsafe(resolve, result, error)
+        except RuntimeError:  # event loop já fechado
+            pass
+    
+    threading.Thread(target=worker, name=f'yt-bot-{func.__name__}', daemon=True).start()
+    return await future
+
+class TokenBucket:
+    """Limitador de taxa (token bucket) seguro para uso entre threads"""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Consome um token, esperando o tempo necessário se o balde estiver vazio"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            # Saldo negativo reserva tokens futuros: chamadas simultâneas esperam em fila
+            wait = (1 - self.tokens) / self.rate if self.tokens < 1 else 0
+            self.tokens -= 1
+        
+        if wait:
+            time.sleep(wait)
+
 class YouTubeTelegramBot:
     def __init__(self):
         self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
@@ -20,38 +196,171 @@ class YouTubeTelegramBot:
         self.channels_file = 'channels.json'
         self.last_update_id = 0
         
+        # Tabela de comandos: nome -> (método, mensagem de uso se o comando exige argumento)
+        self.commands = {
+            '/start': (self.cmd_start, None),
+            '/help': (self.cmd_help, None),
+            '/list': (self.cmd_list_channels, None),
+            '/status': (self.cmd_status, None),
+            '/add': (self.cmd_add_channel, "❌ Use: /add [Channel ID]\n\nExemplo: /add UCU5JicSrEM5A63jkJ2QvGYw\n\nDigite /help para ver como encontrar o Channel ID."),
+            '/remove': (self.cmd_remove_channel, "❌ Use: /remove [nome do canal]")
+        }
+        
+        # URLs da API do Telegram (montadas uma única vez)
+        self.send_message_url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+        self.get_updates_url = f"https://api.telegram.org/bot{self.bot_token}/getUpdates"
+        self.edit_message_url = f"https://api.telegram.org/bot{self.bot_token}/editMessageText"
+        
+        # Limite global de envio do Telegram (~30 msg/s): 25 msg/s com rajada de 20
+        self.telegram_limiter = TokenBucket(rate=25, capacity=20)
+        
+        # Comandos e verificação de vídeos rodam em threads diferentes
+        self.data_lock = threading.Lock()
+        
+        # ETag/Last-Modified e últimos vídeos de cada feed RSS (por channel_id)
+        self.feed_cache = {}
+        
+        # Pool de threads compartilhado para buscas de feeds e envio de notificações
+        self.pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='yt-bot')
+        
+        # Limita buscas simultâneas ao YouTube (evita throttling)
+        self.feed_semaphore = threading.BoundedSemaphore(10)
+        
+        # Conteúdo já lido dos arquivos JSON: (st_mtime_ns, dados)
+        self._data_cache = (None, None)
+        self._channels_cache = (None, None)
+        
+        # Sessão HTTP persistente (reaproveita conexões keep-alive com Telegram e YouTube)
+        self.session = requests.Session()
+        # Só dois hosts (api.telegram.org e www.youtube.com); pool_maxsize cobre os 16 workers do pool
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=20,
+            pool_block=False,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        ))
+        # getUpdates tem adaptador próprio: sem retry de leitura (não reenvia um long poll de 50s que expirou)
+        # e sem 429 na lista, para get_telegram_updates receber a resposta e respeitar o retry_after
+        self.session.mount(self.get_updates_url, HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=1,
+            max_retries=Retry(total=3, read=0, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504])
+        ))
+        self.session.headers.update({
+            'User-Agent': 'yt-telegram-bot',
+            'Accept-Encoding': 'gzip, deflate'
+        })
+        
         if not self.bot_token or not self.chat_id:
             raise ValueError("TELEGRAM_BOT_TOKEN e CHAT_ID devem estar definidos nas variáveis de ambiente")
         
+        # chat.id chega como int nos updates: converte uma única vez para comparar direto
+        self.allowed_chat_id = int(self.chat_id) if self.chat_id.lstrip('-').isdigit() else None
+        
+        # Grupos e canais (ID negativo ou @nome) aceitam ~20 msg/min: limita só as notificações enviadas a eles
+        self.chat_limiter = TokenBucket(rate=18 / 60, capacity=18) if not self.chat_id.isdigit() else None
+        
         logger.info(f"Bot inicializado para chat ID: {self.chat_id}")
     
+    def close(self):
+        """Libera o pool de threads e as conexões HTTP"""
+        # Descarta tarefas ainda na fila; as já em andamento terminam pelo timeout das requisições
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+    
+    def write_json_atomic(self, path: str, obj, pretty: bool = True):
+        """Grava JSON em arquivo temporário e troca atomicamente (evita arquivo truncado em caso de crash)"""
+        tmp_file = path + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(json_dumps(obj, pretty=pretty))
+            f.flush()
+            os.fsync(f.fileno())
+        
+        # Guarda a versão anterior como .bak: hard link (ou cópia) num nome temporário trocado atomicamente,
+        # para que nunca haja instante sem .bak
+        if os.path.exists(path):
+            backup_tmp = path + '.bak.tmp'
+            if os.path.exists(backup_tmp):
+                os.remove(backup_tmp)  # sobra de um crash anterior
+            try:
+                os.link(path, backup_tmp)
+            except OSError:
+                shutil.copy2(path, backup_tmp)
+            os.replace(backup_tmp, path + '.bak')
+        
+        os.replace(tmp_file, path)
+    
+    def read_json(self, path: str):
+        """Lê um arquivo JSON; se estiver corrompido, recorre ao .bak da gravação anterior"""
+        try:
+            with open(path, 'rb') as f:
+                return json_loads(f.read())
+        except ValueError as e:
+            logger.error(f"Arquivo {path} corrompido ({e}), usando backup {path}.bak")
+            with open(path + '.bak', 'rb') as f:
+                return json_loads(f.read())
+    
     def load_data(self) -> Dict:
-        """Carrega dados dos últimos vídeos enviados"""
+        """Carrega dados dos últimos vídeos enviados (relê o arquivo só se ele mudou)"""
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            mtime = os.stat(self.data_file).st_mtime_ns
         except FileNotFoundError:
             logger.info("Arquivo de dados não encontrado, criando novo...")
             return {}
+        
+        if mtime == self._data_cache[0]:
+            return self._data_cache[1]
+        
+        data = self.read_json(self.data_file)
+        # Em memória os IDs já vistos ficam num dict (conjunto ordenado, mais novo primeiro, consulta O(1))
+        for channel_data in data.values():
+            channel_data['last_video_ids'] = dict.fromkeys(channel_data.get('last_video_ids', []))
+        
+        self._data_cache = (mtime, data)
+        return data
     
     def save_data(self, data: Dict):
         """Salva dados dos últimos vídeos"""
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # No disco os IDs já vistos são uma lista (mais novo primeiro)
+        serializable = {
+            channel_id: {**channel_data, 'last_video_ids': list(channel_data['last_video_ids'])}
+            for channel_id, channel_data in data.items()
+        }
+        # Arquivo só de máquina: JSON compacto
+        self.write_json_atomic(self.data_file, serializable, pretty=False)
+        
+        self._data_cache = (os.stat(self.data_file).st_mtime_ns, data)
     
     def load_channels(self) -> List[Dict]:
-        """Carrega lista de canais para monitorar"""
+        """Carrega lista de canais para monitorar (relê o arquivo só se ele mudou)"""
         try:
-            with open(self.channels_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            mtime = os.stat(self.channels_file).st_mtime_ns
         except FileNotFoundError:
             logger.info("Arquivo de canais não encontrado, criando novo...")
-            return []
+            channels = []
+            self.index_channels(channels)
+            return channels
+        
+        if mtime == self._channels_cache[0]:
+            return self._channels_cache[1]
+        
+        channels = self.read_json(self.channels_file)
+        
+        self.index_channels(channels)
+        self._channels_cache = (mtime, channels)
+        return channels
     
     def save_channels(self, channels: List[Dict]):
         """Salva lista de canais"""
-        with open(self.channels_file, 'w', encoding='utf-8') as f:
-            json.dump(channels, f, ensure_ascii=False, indent=2)
+        self.write_json_atomic(self.channels_file, channels)
+        
+        self.index_channels(channels)
+        self._channels_cache = (os.stat(self.channels_file).st_mtime_ns, channels)
+    
+    def index_channels(self, channels: List[Dict]):
+        """Monta índices dos canais por ID e por nome (casefold, para busca sem diferenciar maiúsculas)"""
+        self.channels_by_id = {c['channel_id']: c for c in channels}
+        self.channels_by_name = {c['name'].casefold(): c for c in channels}
     
     def extract_channel_id_simple(self, input_text: str) -> str:
         """Extrai ou valida Channel ID - aceita apenas IDs diretos"""
@@ -59,12 +368,12 @@ class YouTubeTelegramBot:
         input_text = input_text.strip()
         
         # Se já é um channel ID válido (UC + 22 caracteres)
-        if re.match(r'^UC[a-zA-Z0-9_-]{22}$', input_text):
+        if _CHANNEL_ID_RE.match(input_text):
             logger.info(f"Channel ID válido detectado: {input_text}")
             return input_text
         
         # Tenta extrair de URL se ainda contém /channel/
-        channel_match = re.search(r'youtube\.com/channel/([UC][a-zA-Z0-9_-]{22})', input_text)
+        channel_match = _URL_CHANNEL_RE.search(input_text)
         if channel_match:
             channel_id = channel_match.group(1)
             logger.info(f"Channel ID extraído de URL: {channel_id}")
@@ -74,203 +383,228 @@ class YouTubeTelegramBot:
         logger.warning(f"Formato não reconhecido: {input_text}")
         return None
     
-    def validate_channel_simple(self, channel_id: str) -> tuple:
-        """Validação simples do canal - retorna (é_válido, nome_do_canal)"""
-        try:
-            rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-            logger.info(f"Validando canal: {channel_id}")
-            
-            response = requests.get(rss_url, timeout=15)
-            
-            if response.status_code == 200:
-                feed = feedparser.parse(response.content)
-                
-                if feed.entries and len(feed.entries) > 0:
-                    channel_name = feed.entries[0].author if hasattr(feed.entries[0], 'author') else "Canal do YouTube"
-                    logger.info(f"Canal válido: {channel_name}")
-                    return True, channel_name
-            
-            logger.warning(f"Canal inválido ou sem vídeos: {channel_id}")
-            return False, None
+    def parse_feed(self, source, limit: int = _FEED_LIMIT) -> List[Video]:
+        """Extrai os vídeos mais recentes do feed Atom do YouTube (esquema fixo)
+        
+        Lê o XML de forma incremental a partir de um arquivo/stream e para após `limit` entradas.
+        """
+        videos = []
+        for _, entry in ET.iterparse(source, events=('end',)):
+            if entry.tag != _ENTRY_TAG:
+                continue
             
-        except Exception as e:
-            logger.error(f"Erro na validação: {e}")
-            return False, None
+            link = entry.find("a:link[@rel='alternate']", _FEED_NS)
+            video_id = entry.findtext('yt:videoId', namespaces=_FEED_NS) or entry.findtext('a:id', '', _FEED_NS).split(':')[-1]
+            videos.append(Video(
+                video_id=video_id,
+                title=entry.findtext('a:title', '', _FEED_NS),
+                link=link.get('href') if link is not None else f"https://www.youtube.com/watch?v={video_id}",
+                published=entry.findtext('a:published', '', _FEED_NS),
+                channel_name=entry.findtext('a:author/a:name', namespaces=_FEED_NS) or "Canal do YouTube"
+            ))
+            
+            # Libera a entrada já processada e encerra ao atingir o limite
+            entry.clear()
+            if len(videos) >= limit:
+                break
+        
+        return videos
     
-    def get_channel_videos(self, channel_id: str) -> List[Dict]:
-        """Busca vídeos recentes de um canal via RSS"""
+    def get_channel_videos(self, channel_id: str) -> Optional[List[Video]]:
+        """Busca vídeos recentes de um canal via RSS - retorna None se o feed não pôde ser obtido"""
         try:
             rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-            response = requests.get(rss_url, timeout=15)
-            
-            if response.status_code != 200:
-                return []
-            
-            feed = feedparser.parse(response.content)
             
-            videos = []
-            for entry in feed.entries[:5]:  # Últimos 5 vídeos
-                videos.append({
-                    'video_id': entry.yt_videoid if hasattr(entry, 'yt_videoid') else entry.id.split(':')[-1],
-                    'title': entry.title,
-                    'link': entry.link,
-                    'published': entry.published,
-                    'channel_name': entry.author if hasattr(entry, 'author') else "Canal do YouTube"
-                })
+            # GET condicional: se o feed não mudou o YouTube responde 304 sem corpo
+            cached = self.feed_cache.get(channel_id)
+            headers = {}
+            if cached:
+                if cached.get('etag'):
+                    headers['If-None-Match'] = cached['etag']
+                if cached.get('last_modified'):
+                    headers['If-Modified-Since'] = cached['last_modified']
+            
+            with self.feed_semaphore, self.session.get(rss_url, headers=headers, timeout=15, stream=True) as response:
+                if response.status_code == 304 and cached:
+                    return cached['videos']
+                
+                if response.status_code != 200:
+                    logger.warning(f"Feed do canal {channel_id} retornou HTTP {response.status_code}")
+                    return None
+                
+                # Parse direto do stream (descompactando gzip), sem montar o corpo inteiro em memória
+                response.raw.decode_content = True
+                videos = self.parse_feed(response.raw)
+                
+                # Descarta o restante do corpo para a conexão voltar ao pool
+                for _ in response.iter_content(chunk_size=65536):
+                    pass
+            
+            self.feed_cache[channel_id] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'videos': videos
+            }
             
             return videos
             
-        except Exception as e:
+        except (requests.RequestException, urllib3.exceptions.HTTPError, ET.ParseError) as e:
             logger.error(f"Erro ao buscar vídeos do canal {channel_id}: {e}")
-            return []
+            return None
     
-    def send_telegram_message(self, message: str):
-        """Envia mensagem para o Telegram"""
+    def call_telegram(self, url: str, payload: Dict, limiter: Optional[TokenBucket] = None) -> Optional[Dict]:
+        """Chama um método da API do Telegram respeitando o limite de envio - retorna o 'result' ou None"""
+        # Serializa uma única vez (compacto), reaproveitado nas novas tentativas
+        body = json_dumps(payload, pretty=False)
         try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-            payload = {
-                'chat_id': self.chat_id,
-                'text': message,
-                'parse_mode': 'HTML',
-                'disable_web_page_preview': False
-            }
-            
-            response = requests.post(url, json=payload, timeout=10)
+            for attempt in range(3):
+                if limiter:
+                    limiter.acquire()
+                self.telegram_limiter.acquire()
+                response = self.session.post(url, data=body, headers=_JSON_HEADERS, timeout=10)
+                
+                if response.status_code != 429 or attempt == 2:
+                    break
+                
+                # Limite estourado: o Telegram informa quanto esperar antes de reenviar
+                retry_after = json_loads(response.content).get('parameters', {}).get('retry_after', 1)
+                logger.warning(f"Limite de envio atingido, aguardando {retry_after}s")
+                time.sleep(retry_after)
             
             if response.status_code == 200:
-                logger.info("Mensagem enviada com sucesso!")
-                return True
+                return json_loads(response.content).get('result', {})
             else:
-                logger.error(f"Erro ao enviar mensagem: {response.text}")
-                return False
+                # Corpo completo da resposta: o Telegram explica ali o motivo (ex.: HTML inválido no texto)
+                logger.error(f"Erro ao chamar Telegram (HTTP {response.status_code}): {response.text}")
+                return None
                 
-        except Exception as e:
-            logger.error(f"Erro ao enviar mensagem: {e}")
-            return False
+        except (requests.RequestException, ValueError) as e:
+            logger.error(f"Erro ao chamar Telegram: {e}")
+            return None
     
-    def get_telegram_updates(self):
-        """Busca atualizações do Telegram"""
+    def send_telegram_message(self, message: str, notification: bool = False) -> Optional[int]:
+        """Envia mensagem para o Telegram - retorna o message_id (ou None em caso de erro)
+        
+        Notificações passam também pelo limite por chat; respostas a comandos não esperam por ele.
+        """
+        payload = {
+            'chat_id': self.chat_id,
+            'text': message,
+            'parse_mode': 'HTML',
+            'disable_web_page_preview': False
+        }
+        
+        result = self.call_telegram(self.send_message_url, payload, self.chat_limiter if notification else None)
+        if result is None:
+            return None
+        
+        logger.info("Mensagem enviada com sucesso!")
+        return result.get('message_id')
+    
+    def edit_telegram_message(self, message_id: int, message: str) -> bool:
+        """Substitui o texto de uma mensagem já enviada"""
+        payload = {
+            'chat_id': self.chat_id,
+            'message_id': message_id,
+            'text': message,
+            'parse_mode': 'HTML',
+            'disable_web_page_preview': False
+        }
+        
+        return self.call_telegram(self.edit_message_url, payload) is not None
+    
+    def get_telegram_updates(self) -> Optional[List[Dict]]:
+        """Busca atualizações do Telegram - retorna None se a chamada falhou"""
         try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/getUpdates"
-            params = {'offset': self.last_update_id + 1, 'timeout': 2}
+            # Long polling: o Telegram segura a requisição até 50s esperando mensagens
+            # allowed_updates (array JSON) descarta no servidor tudo que não for mensagem
+            params = {'offset': self.last_update_id + 1, 'timeout': 50, 'allowed_updates': '["message"]'}
             
-            response = requests.get(url, params=params, timeout=10)
+            # Timeout do cliente maior que o do servidor para não cortar a resposta
+            response = self.session.get(self.get_updates_url, params=params, timeout=60)
             
             if response.status_code == 200:
-                data = response.json()
+                data = json_loads(response.content)
                 return data.get('result', [])
+            elif response.status_code == 429:
+                # Limite estourado: espera exatamente o tempo informado pelo Telegram
+                retry_after = json_loads(response.content).get('parameters', {}).get('retry_after', 1)
+                logger.warning(f"Limite de updates atingido, aguardando {retry_after}s")
+                time.sleep(retry_after)
+                return []
             else:
                 logger.warning(f"Erro ao buscar updates: {response.status_code}")
-                return []
+                return None
                 
-        except Exception as e:
+        except (requests.RequestException, ValueError) as e:
             logger.error(f"Erro ao buscar updates: {e}")
-            return []
+            return None
     
-    def process_telegram_commands(self):
-        """Processa comandos recebidos do Telegram"""
+    def process_telegram_commands(self) -> bool:
+        """Processa comandos recebidos do Telegram - retorna False se não foi possível buscar updates"""
         updates = self.get_telegram_updates()
+        if updates is None:
+            return False
         
         for update in updates:
             try:
                 self.last_update_id = update['update_id']
+                message = update.get('message')
+                if message is None:
+                    continue
                 
-                if 'message' in update:
-                    message = update['message']
-                    text = message.get('text', '').strip()
-                    chat_id = str(message['chat']['id'])
-                    
-                    logger.info(f"Mensagem recebida: '{text}' do chat: {chat_id}")
-                    
-                    # Verifica se é do chat correto
-                    if chat_id != self.chat_id:
-                        logger.warning(f"Mensagem de chat incorreto: {chat_id} != {self.chat_id}")
-                        continue
-                    
-                    # Processa comandos
-                    if text.startswith('/'):
-                        logger.info(f"Processando comando: {text}")
-                        self.handle_command(text)
-                    
-            except Exception as e:
+                # Ignora mensagens sem texto (fotos, stickers...) e textos que não são comandos
+                text = message.get('text')
+                if not text or not text.startswith('/'):
+                    continue
+                
+                chat_id = message['chat']['id']
+            except (KeyError, TypeError, AttributeError) as e:
                 logger.error(f"Erro ao processar update: {e}")
                 continue
+            
+            # Verifica se é do chat correto (log preguiçoso em debug: não formata nada para chats alheios)
+            if chat_id != self.allowed_chat_id:
+                logger.debug("Comando de chat incorreto ignorado: %s", chat_id)
+                continue
+            
+            # Processa comandos (handle_command trata os próprios erros)
+            text = text.strip()
+            logger.info(f"Processando comando: {text}")
+            self.handle_command(text)
+        
+        return True
     
     def handle_command(self, command: str):
         """Processa comandos específicos"""
+        parts = command.split(None, 1)  # Divide em no máximo 2 partes
+        cmd = parts[0].lower()
+        
+        logger.info(f"Comando recebido: {cmd}")
+        
+        entry = self.commands.get(cmd)
+        if entry is None:
+            self.send_telegram_message("❌ Comando não reconhecido. Use /help para ver os comandos disponíveis.")
+            return
+        
+        handler, usage = entry
+        if usage is not None and len(parts) < 2:
+            self.send_telegram_message(usage)
+            return
+        
+        # Só a execução do comando fica protegida: qualquer falha vira resposta de erro ao usuário
         try:
-            parts = command.split(None, 1)  # Divide em no máximo 2 partes
-            cmd = parts[0].lower()
-            
-            logger.info(f"Comando recebido: {cmd}")
-            
-            if cmd == '/start':
-                self.cmd_start()
-            elif cmd == '/help':
-                self.cmd_help()
-            elif cmd == '/list':
-                self.cmd_list_channels()
-            elif cmd == '/add':
-                if len(parts) > 1:
-                    self.cmd_add_channel(parts[1])
-                else:
-                    self.send_telegram_message("❌ Use: /add [Channel ID]\n\nExemplo: /add UCU5JicSrEM5A63jkJ2QvGYw\n\nDigite /help para ver como encontrar o Channel ID.")
-            elif cmd == '/remove':
-                if len(parts) > 1:
-                    self.cmd_remove_channel(parts[1])
-                else:
-                    self.send_telegram_message("❌ Use: /remove [nome do canal]")
-            elif cmd == '/status':
-                self.cmd_status()
+            if usage is None:
+                handler()
             else:
-                self.send_telegram_message("❌ Comando não reconhecido. Use /help para ver os comandos disponíveis.")
-                
+                handler(parts[1])
         except Exception as e:
             logger.error(f"Erro ao processar comando {command}: {e}")
             self.send_telegram_message("❌ Erro interno. Tente novamente em alguns segundos.")
     
     def cmd_start(self):
         """Comando /start"""
-        message = """🤖 <b>YouTube Telegram Bot</b>
-
-Olá! Eu monitoro canais do YouTube e te aviso quando há novos vídeos.
-
-<b>⚡ IMPORTANTE:</b> Eu só notífico sobre vídeos publicados APÓS você adicionar o canal (não de vídeos antigos).
-
-<b>Comandos disponíveis:</b>
-/help - Mostra esta ajuda
-/add [Channel ID] - Adiciona um canal para monitorar
-/remove [nome] - Remove um canal
-/list - Lista canais monitorados
-/status - Status do bot
-
-<b>⚠️ IMPORTANTE: Use o Channel ID (formato UC...)</b>
-
-<b>📺 Como encontrar o Channel ID:</b>
-
-<b>Método 1 - URL direta:</b>
-Se a URL for: youtube.com/channel/UCxxxx
-→ Copie: UCxxxx
-
-<b>Método 2 - Via qualquer vídeo:</b>
-1. Abra qualquer vídeo do canal
-2. Clique no nome do canal
-3. Na URL que abrir, copie o UCxxxx
-
-<b>Método 3 - Código fonte:</b>
-1. Vá no canal
-2. Clique com botão direito → "Ver código fonte"
-3. Ctrl+F → "channelId"
-4. Copie o UCxxxx
-
-<b>Exemplo:</b>
-/add UCU5JicSrEM5A63jkJ2QvGYw
-
-🎯 Vídeos atuais são marcados como "já vistos" automaticamente!
-
-Pronto para começar! 🚀"""
-        
-        self.send_telegram_message(message)
+        self.send_telegram_message(_START_MESSAGE)
     
     def cmd_help(self):
         """Comando /help"""
@@ -278,9 +612,14 @@ Pronto para começar! 🚀"""
     
     def cmd_add_channel(self, channel_input: str):
         """Adiciona um canal para monitorar"""
+        # Respostas após a validação editam a mensagem de progresso em vez de enviar outra
+        progress_id = None
+        
+        def reply(message: str):
+            if not (progress_id and self.edit_telegram_message(progress_id, message)):
+                self.send_telegram_message(message)
+        
         try:
-            self.send_telegram_message("🔍 Validando Channel ID...")
-            
             # Extrai/valida channel ID
             logger.info(f"Processando entrada: {channel_input}")
             channel_id = self.extract_channel_id_simple(channel_input)
@@ -304,13 +643,28 @@ youtube.com/channel/UCxxxx → copie UCxxxx
 /add UCU5JicSrEM5A63jkJ2QvGYw""")
                 return
             
+            # Carrega canais existentes
+            channels = self.load_channels()
+            
+            # Verifica se já existe (antes de qualquer requisição ao YouTube)
+            existing = self.channels_by_id.get(channel_id)
+            if existing:
+                self.send_telegram_message(f"⚠️ Canal <b>{html.escape(existing['name'])}</b> já está sendo monitorado!")
+                return
+            
             logger.info(f"Channel ID a ser validado: {channel_id}")
+            progress_id = self.send_telegram_message("🔍 Validando Channel ID...")
             
-            # Valida canal
-            is_valid, channel_name = self.validate_channel_simple(channel_id)
+            # Uma única busca no RSS valida o canal e traz os vídeos atuais
+            current_videos = self.get_channel_videos(channel_id)
             
-            if not is_valid:
-                self.send_telegram_message(f"""❌ <b>Channel ID inválido ou canal sem vídeos públicos</b>
+            if not current_videos:
+                if current_videos is None:
+                    title = "Channel ID inválido ou canal inacessível"
+                else:
+                    title = "Canal sem vídeos públicos"
+                
+                reply(f"""❌ <b>{title}</b>
 
 🆔 ID testado: <code>{channel_id}</code>
 
@@ -323,57 +677,47 @@ youtube.com/channel/UCxxxx → copie UCxxxx
 youtube.com/channel/{channel_id}""")
                 return
             
-            # Carrega canais existentes
-            channels = self.load_channels()
-            
-            # Verifica se já existe
-            for channel in channels:
-                if channel['channel_id'] == channel_id:
-                    self.send_telegram_message(f"⚠️ Canal <b>{channel_name}</b> já está sendo monitorado!")
-                    return
+            channel_name = current_videos[0].channel_name
+            logger.info(f"Canal válido: {channel_name}")
             
-            # Busca vídeos atuais para marcar como "já vistos"
-            self.send_telegram_message("🔄 Configurando monitoramento (marcando vídeos atuais como já vistos)...")
+            # Salva os vídeos atuais como já processados (SEM enviar notificações)
+            current_video_ids = dict.fromkeys(v.video_id for v in current_videos)
             
-            current_videos = self.get_channel_videos(channel_id)
-            if current_videos:
-                # Salva os vídeos atuais como já processados (SEM enviar notificações)
+            with self.data_lock:
                 saved_data = self.load_data()
-                current_video_ids = [v['video_id'] for v in current_videos]
-                
                 saved_data[channel_id] = {
                     'last_video_ids': current_video_ids,
+                    'head_id': current_videos[0].video_id,
                     'channel_name': channel_name
                 }
-                
                 self.save_data(saved_data)
-                logger.info(f"Marcados {len(current_video_ids)} vídeos existentes como já vistos para o canal {channel_name}")
+            logger.info(f"Marcados {len(current_video_ids)} vídeos existentes como já vistos para o canal {channel_name}")
             
             # Adiciona novo canal
             new_channel = {
                 'name': channel_name,
                 'channel_id': channel_id,
                 'enabled': True,
-                'added_date': datetime.now().isoformat()
+                'added_date': datetime.now(timezone.utc).isoformat()
             }
             
             channels.append(new_channel)
             self.save_channels(channels)
             
-            video_count = len(current_videos) if current_videos else 0
+            video_count = len(current_videos)
             
-            self.send_telegram_message(f"""✅ <b>Canal adicionado com sucesso!</b>
+            reply(f"""✅ <b>Canal adicionado com sucesso!</b>
 
-📺 <b>Nome:</b> {channel_name}
+📺 <b>Nome:</b> {html.escape(channel_name)}
 🆔 <b>ID:</b> <code>{channel_id}</code>
 📹 <b>Vídeos atuais:</b> {video_count} (marcados como já vistos)
 
 🔔 <b>A partir de agora você receberá notificações APENAS dos novos vídeos!</b>
 ⏱️ Verificação: a cada 1 minuto""")
             
-        except Exception as e:
+        except (OSError, ValueError) as e:
             logger.error(f"Erro ao adicionar canal: {e}")
-            self.send_telegram_message(f"❌ Erro interno ao adicionar canal.\n\nTente novamente em alguns segundos.")
+            reply("❌ Erro interno ao adicionar canal.\n\nTente novamente em alguns segundos.")
     
     def cmd_remove_channel(self, channel_name: str):
         """Remove um canal"""
@@ -384,27 +728,28 @@ youtube.com/channel/{channel_id}""")
                 self.send_telegram_message("📭 Nenhum canal está sendo monitorado.")
                 return
             
-            # Busca canal por nome (case insensitive)
-            found_channel = None
-            for i, channel in enumerate(channels):
-                if channel_name.lower() in channel['name'].lower():
-                    found_channel = (i, channel)
-                    break
+            # Busca canal por nome (case insensitive): exato primeiro, depois parcial
+            key = channel_name.strip().casefold()
+            channel = self.channels_by_name.get(key)
+            if channel is None:
+                channel = next((c for name, c in self.channels_by_name.items() if key in name), None)
             
-            if not found_channel:
-                self.send_telegram_message(f"❌ Canal '{channel_name}' não encontrado.\n\nUse /list para ver os canais monitorados.")
+            if channel is None:
+                self.send_telegram_message(f"❌ Canal '{html.escape(channel_name)}' não encontrado.\n\nUse /list para ver os canais monitorados.")
                 return
             
-            index, channel = found_channel
             removed_name = channel['name']
             
             # Remove canal
-            channels.pop(index)
+            channels.remove(channel)
             self.save_channels(channels)
             
-            self.send_telegram_message(f"✅ Canal <b>{removed_name}</b> removido com sucesso!")
+            # Descarta ETag/vídeos em cache do feed do canal removido
+            self.feed_cache.pop(channel['channel_id'], None)
             
-        except Exception as e:
+            self.send_telegram_message(f"✅ Canal <b>{html.escape(removed_name)}</b> removido com sucesso!")
+            
+        except (OSError, ValueError) as e:
             logger.error(f"Erro ao remover canal: {e}")
             self.send_telegram_message("❌ Erro ao remover canal. Tente novamente.")
     
@@ -417,17 +762,16 @@ youtube.com/channel/{channel_id}""")
                 self.send_telegram_message("📭 Nenhum canal está sendo monitorado.\n\nUse /add [Channel ID] para adicionar um canal.\n\nDigite /help para ver como encontrar o Channel ID.")
                 return
             
-            message = "📺 <b>Canais monitorados:</b>\n\n"
-            
+            # Monta as partes numa lista e junta uma única vez
+            parts = ["📺 <b>Canais monitorados:</b>"]
             for i, channel in enumerate(channels, 1):
                 status = "✅" if channel.get('enabled', True) else "⏸️"
-                message += f"{i}. {status} <b>{channel['name']}</b>\n"
-                message += f"   <code>{channel['channel_id']}</code>\n\n"
+                parts.append(f"{i}. {status} <b>{html.escape(channel['name'])}</b>\n   <code>{channel['channel_id']}</code>")
+            parts.append(f"Total: {len(channels)} canais")
             
-            message += f"Total: {len(channels)} canais"
-            self.send_telegram_message(message)
+            self.send_telegram_message("\n\n".join(parts))
             
-        except Exception as e:
+        except (OSError, ValueError) as e:
             logger.error(f"Erro ao listar canais: {e}")
             self.send_telegram_message("❌ Erro ao listar canais.")
     
@@ -435,143 +779,219 @@ youtube.com/channel/{channel_id}""")
         """Mostra status do bot"""
         try:
             channels = self.load_channels()
-            data = self.load_data()
+            
+            # O dict em cache é alterado pela thread de verificação: conta dentro da seção crítica
+            # Vídeos rastreados = os que estão no feed de cada canal, não o histórico inteiro de IDs vistos
+            with self.data_lock:
+                data = self.load_data()
+                total_videos_tracked = sum(min(len(d.get('last_video_ids', [])), _FEED_LIMIT) for d in data.values())
             
             enabled_channels = sum(1 for c in channels if c.get('enabled', True))
-            total_videos_tracked = sum(len(d.get('last_video_ids', [])) for d in data.values())
             
-            message = f"""📊 <b>Status do Bot</b>
-
-🎯 <b>Canais monitorados:</b> {enabled_channels}/{len(channels)}
-📹 <b>Vídeos rastreados:</b> {total_videos_tracked}
-🔄 <b>Verificação:</b> A cada 1 minuto
-✅ <b>Status:</b> Ativo
-
-<b>Última verificação:</b> {datetime.now().strftime('%d/%m/%Y %H:%M')}
-
-⚡ <b>Responsividade:</b> Comandos processados a cada 5 segundos"""
+            message = _STATUS_TEMPLATE.format(
+                enabled=enabled_channels,
+                total=len(channels),
+                tracked=total_videos_tracked,
+                now=datetime.now(timezone.utc).strftime('%d/%m/%Y %H:%M UTC')
+            )
             
             self.send_telegram_message(message)
             
-        except Exception as e:
+        except (OSError, ValueError) as e:
             logger.error(f"Erro ao mostrar status: {e}")
             self.send_telegram_message("❌ Erro ao mostrar status.")
     
-    def format_video_message(self, video: Dict, channel_name: str) -> str:
+    def format_video_message(self, video: Video, channel_name: str) -> str:
         """Formata mensagem do vídeo para o Telegram"""
-        return f"""🎥 <b>Novo vídeo no canal {channel_name}!</b>
-
-📹 <b>{video['title']}</b>
-
-🔗 <a href="{video['link']}">Assistir agora</a>
-
-📅 {video['published']}"""
+        return _VIDEO_TEMPLATE.format(
+            channel_name=html.escape(channel_name),
+            title=html.escape(video.title),
+            link=html.escape(video.link),
+            published=video.published
+        )
+    
+    def format_channel_notification(self, videos: List[Video], channel_name: str) -> str:
+        """Formata uma única mensagem com todos os vídeos novos de um canal"""
+        if len(videos) == 1:
+            return self.format_video_message(videos[0], channel_name)
+        
+        entries = [
+            _VIDEO_ENTRY_TEMPLATE.format(title=html.escape(video.title), link=html.escape(video.link), published=video.published)
+            for video in videos
+        ]
+        return f"🎥 <b>{len(videos)} novos vídeos no canal {html.escape(channel_name)}!</b>\n\n" + "\n\n".join(entries)
+    
+    def batch_notifications(self, pending: List[tuple]) -> List[tuple]:
+        """Junta as notificações de vários canais em mensagens de até 4096 caracteres - retorna (texto, vídeos)"""
+        batches = []
+        for videos, channel_name in pending:
+            text = self.format_channel_notification(videos, channel_name)
+            if batches and len(batches[-1][0]) + len(_NOTIFICATION_SEPARATOR) + len(text) <= _MAX_MESSAGE_LENGTH:
+                batch_text, batch_videos = batches[-1]
+                batches[-1] = (batch_text + _NOTIFICATION_SEPARATOR + text, batch_videos + videos)
+            else:
+                batches.append((text, list(videos)))
+        return batches
     
     def check_new_videos(self):
         """Verifica novos vídeos em todos os canais"""
         try:
             channels = self.load_channels()
-            if not channels:
+            enabled = [c for c in channels if c.get('enabled', True)]
+            if not enabled:
                 logger.info("Nenhum canal para verificar")
                 return
             
-            logger.info(f"Verificando {len(channels)} canais...")
-            saved_data = self.load_data()
-            new_videos_found = False
+            logger.info(f"Verificando {len(enabled)} canais...")
             
-            for channel in channels:
-                if not channel.get('enabled', True):
-                    continue
-                    
-                channel_id = channel['channel_id']
-                channel_name = channel['name']
-                
-                logger.info(f"Verificando canal: {channel_name}")
-                
-                videos = self.get_channel_videos(channel_id)
-                if not videos:
-                    logger.warning(f"Nenhum vídeo encontrado para {channel_name}")
-                    continue
-                
-                # Verifica se já temos dados deste canal
-                if channel_id not in saved_data:
-                    # Canal novo - isso não deveria acontecer se foi adicionado corretamente
-                    logger.warning(f"Canal {channel_name} não tem dados salvos, pulando primeira verificação")
-                    saved_data[channel_id] = {
-                        'last_video_ids': [v['video_id'] for v in videos],
-                        'channel_name': channel_name
-                    }
-                    continue
-                
-                last_video_ids = set(saved_data[channel_id]['last_video_ids'])
-                
-                # Verifica novos vídeos (só os que NÃO estão na lista de já vistos)
-                new_videos_in_this_channel = []
-                for video in videos:
-                    if video['video_id'] not in last_video_ids:
-                        new_videos_in_this_channel.append(video)
-                        logger.info(f"🎬 NOVO VÍDEO encontrado: {video['title']} - Canal: {channel_name}")
-                
-                # Envia notificações apenas dos vídeos realmente novos
-                for video in new_videos_in_this_channel:
-                    message = self.format_video_message(video, channel_name)
-                    if self.send_telegram_message(message):
-                        new_videos_found = True
-                        logger.info(f"✅ Notificação enviada: {video['title']}")
+            # Notificações pendentes (vídeos novos, channel_name), uma mensagem por canal ao final do ciclo
+            pending = []
+            
+            # Busca os feeds de todos os canais em paralelo (I/O de rede)
+            results = list(self.pool.map(lambda c: (c, self.get_channel_videos(c['channel_id'])), enabled))
+            
+            # Seção crítica: cmd_add_channel também grava videos_data.json
+            with self.data_lock:
+                saved_data = self.load_data()
+                dirty = False
                 
-                # Atualiza lista de vídeos conhecidos (mantém apenas os 10 mais recentes)
-                current_video_ids = [v['video_id'] for v in videos]
-                saved_data[channel_id]['last_video_ids'] = current_video_ids
-                saved_data[channel_id]['channel_name'] = channel_name
+                for channel, videos in results:
+                    channel_id = channel['channel_id']
+                    channel_name = channel['name']
+                    
+                    logger.info(f"Verificando canal: {channel_name}")
+                    
+                    if not videos:
+                        logger.warning(f"Nenhum vídeo encontrado para {channel_name}")
+                        continue
+                    
+                    # Verifica se já temos dados deste canal
+                    if channel_id not in saved_data:
+                        # Canal novo - isso não deveria acontecer se foi adicionado corretamente
+                        logger.warning(f"Canal {channel_name} não tem dados salvos, pulando primeira verificação")
+                        saved_data[channel_id] = {
+                            'last_video_ids': dict.fromkeys(v.video_id for v in videos),
+                            'head_id': videos[0].video_id,
+                            'channel_name': channel_name
+                        }
+                        dirty = True
+                        continue
+                    
+                    # Mantém o nome em dia mesmo quando o atalho abaixo pula o canal (ex.: renomeado no channels.json)
+                    if saved_data[channel_id].get('channel_name') != channel_name:
+                        saved_data[channel_id]['channel_name'] = channel_name
+                        dirty = True
+                    
+                    # O feed vem do mais novo para o mais antigo: topo igual = nada mudou
+                    if videos[0].video_id == saved_data[channel_id].get('head_id'):
+                        logger.info(f"📊 Canal {channel_name}: nenhum vídeo novo")
+                        continue
+                    
+                    last_video_ids = saved_data[channel_id]['last_video_ids']
+                    
+                    # Uma só passada: separa os vídeos novos e monta a lista de IDs atuais
+                    new_videos_in_this_channel = []
+                    current_video_ids = []
+                    for video in videos:
+                        current_video_ids.append(video.video_id)
+                        if video.video_id not in last_video_ids:
+                            new_videos_in_this_channel.append(video)
+                            logger.info(f"🎬 NOVO VÍDEO encontrado: {video.title} - Canal: {channel_name}")
+                    
+                    # Agenda notificação apenas dos vídeos realmente novos
+                    if new_videos_in_this_channel:
+                        pending.append((new_videos_in_this_channel, channel_name))
+                    
+                    # Atualiza histórico de vídeos conhecidos: atuais + anteriores, limitado aos mais recentes,
+                    # para que um vídeo que saiu da janela do RSS não reapareça como novo
+                    saved_data[channel_id]['head_id'] = videos[0].video_id
+                    merged = list(dict.fromkeys([*current_video_ids, *last_video_ids]))[:_MAX_SEEN_IDS]
+                    saved_data[channel_id]['last_video_ids'] = dict.fromkeys(merged)
+                    dirty = True
+                    
+                    if new_videos_in_this_channel:
+                        logger.info(f"📊 Canal {channel_name}: {len(new_videos_in_this_channel)} novos vídeos processados")
+                    else:
+                        logger.info(f"📊 Canal {channel_name}: nenhum vídeo novo")
                 
-                if new_videos_in_this_channel:
-                    logger.info(f"📊 Canal {channel_name}: {len(new_videos_in_this_channel)} novos vídeos processados")
-                else:
-                    logger.info(f"📊 Canal {channel_name}: nenhum vídeo novo")
+                # Salva dados atualizados (só se algo mudou)
+                if dirty:
+                    self.save_data(saved_data)
+            
+            # Envia as notificações do ciclo em paralelo (fora da seção crítica), agrupando canais por mensagem
+            batches = self.batch_notifications(pending)
+            sent = list(self.pool.map(lambda batch: self.send_telegram_message(batch[0], notification=True), batches))
+            
+            for (_, videos), ok in zip(batches, sent):
+                if ok:
+                    for video in videos:
+                        logger.info(f"✅ Notificação enviada: {video.title}")
             
-            # Salva dados atualizados
-            self.save_data(saved_data)
+            new_videos_found = any(sent)
             
             if new_videos_found:
                 logger.info("🎉 Enviadas notificações de novos vídeos!")
             else:
                 logger.info("😴 Nenhum vídeo novo encontrado em nenhum canal.")
                 
-        except Exception as e:
+        except (OSError, ValueError) as e:
             logger.error(f"Erro na verificação de vídeos: {e}")
     
     async def run_forever(self):
         """Executa o bot continuamente"""
         logger.info("Bot iniciado! Monitorando canais e comandos...")
         
-        # Envia mensagem de inicialização
-        self.send_telegram_message("🤖 <b>Bot iniciado e funcionando!</b>\n\n⏱️ <b>Verificação:</b> A cada 1 minuto\n\nDigite /help para ver como adicionar canais.")
+        # Envia mensagem de inicialização (fora do event loop, como as demais chamadas HTTP)
+        await asyncio.to_thread(self.send_telegram_message, "🤖 <b>Bot iniciado e funcionando!</b>\n\n⏱️ <b>Verificação:</b> A cada 1 minuto\n\nDigite /help para ver como adicionar canais.")
         
-        # Contador para verificação de vídeos (a cada 1 minuto = 12 ciclos de 5 segundos)
-        video_check_counter = 0
+        # Comandos e verificação de vídeos rodam em tarefas independentes
+        await asyncio.gather(self._poll_updates_loop(), self._check_videos_loop())
+    
+    async def _poll_updates_loop(self):
+        """Processa comandos continuamente via long polling"""
+        backoff = 0
+        while True:
+            try:
+                # getUpdates fica bloqueado no servidor até chegar mensagem (ou 50s)
+                ok = await run_in_daemon_thread(self.process_telegram_commands)
+            except Exception as e:
+                logger.error(f"Erro no loop de comandos: {e}")
+                ok = False
+            
+            if ok:
+                backoff = 0
+                continue
+            
+            # Falha: espera exponencial (1s, 2s, 4s... até 60s) com jitter, zerada no primeiro sucesso
+            backoff = min(backoff * 2, 60) if backoff else 1
+            await asyncio.sleep(backoff + random.random())
+    
+    async def _check_videos_loop(self):
+        """Verifica novos vídeos a cada 1 minuto"""
+        # Agenda por prazo absoluto para a cadência não atrasar com a duração de cada verificação
+        loop = asyncio.get_running_loop()
+        next_check = loop.time() + 60
         
         while True:
+            await asyncio.sleep(max(0, next_check - loop.time()))
             try:
-                # Processa comandos a cada 5 segundos (mais responsivo)
-                self.process_telegram_commands()
-                
-                # Verifica novos vídeos a cada 1 minuto (12 ciclos de 5 segundos)
-                video_check_counter += 1
-                if video_check_counter >= 12:
-                    self.check_new_videos()
-                    video_check_counter = 0
-                
-                await asyncio.sleep(5)  # 5 segundos entre verificações de comandos
-                
+                await run_in_daemon_thread(self.check_new_videos)
             except Exception as e:
-                logger.error(f"Erro no loop principal: {e}")
-                await asyncio.sleep(30)
+                logger.error(f"Erro no loop de vídeos: {e}")
+            
+            # Se a verificação passou do próximo prazo, não acumula execuções atrasadas
+            next_check = max(next_check + 60, loop.time())
 
 def main():
     """Função principal"""
     try:
         bot = YouTubeTelegramBot()
-        asyncio.run(bot.run_forever())
+        # uvloop.run substitui o uvloop.install() (obsoleto no Python 3.12+); uvloop antigo sem run() usa o asyncio
+        run = getattr(uvloop, 'run', None) or asyncio.run
+        try:
+            run(bot.run_forever())
+        finally:
+            bot.close()
     except KeyboardInterrupt:
         logger.info("Bot interrompido pelo usuário")
     except Exception as e: